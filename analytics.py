@@ -0,0 +1,297 @@
+import os
+import sys
+from typing import Dict, Sequence
+
+import numpy as np
+
+# Columns written by MarketMaker.write_state, Order.write_trade and OrderBook
+LOG_COLUMNS = {
+    "state": ["time", "cash", "inventory", "equity", "mid_price", "vwap"],
+    "orders": ["time", "id", "action", "limit", "quantity", "side"],
+    "market": ["time", "price", "quantity"],
+    "orderbook": ["time", "best_bid", "best_ask"],
+}
+
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+
+
+def read_csv(fname: str) -> Dict[str, np.ndarray]:
+    import pandas as pd
+    df = pd.read_csv(fname)
+    cols = {}
+    for col in df.columns:
+        if col in ("action", "side"):
+            cols[col] = df[col].to_numpy(dtype=str)
+        else:
+            cols[col] = df[col].to_numpy(dtype=float)
+    return cols
+
+
+def load_log(dirname: str, name: str) -> Dict[str, np.ndarray]:
+    """
+    Load one of the logs in dirname as a dict of numpy columns.
+    A binary <name>.npy (see to_binary) is preferred over <name>.csv
+    unless the csv has been written since, e.g. by a later run in the
+    same directory. Returns None if neither exists.
+    """
+    npy_fname = os.path.join(dirname, name + ".npy")
+    csv_fname = os.path.join(dirname, name + ".csv")
+
+    npy_is_current = os.path.exists(npy_fname) and (
+        not os.path.exists(csv_fname) or os.path.getmtime(npy_fname) >= os.path.getmtime(csv_fname)
+    )
+    if npy_is_current:
+        data = np.load(npy_fname)
+        return {col: data[col] for col in data.dtype.names}
+
+    if os.path.exists(csv_fname):
+        return read_csv(csv_fname)
+
+    return None
+
+
+def to_binary(dirname: str, names: Sequence[str] = tuple(LOG_COLUMNS)):
+    """
+    Convert the csv logs in dirname to structured .npy files, which
+    load_log reads without any parsing.
+    """
+    for name in names:
+        csv_fname = os.path.join(dirname, name + ".csv")
+        if not os.path.exists(csv_fname):
+            continue
+        cols = read_csv(csv_fname)
+        data = np.empty(len(cols["time"]), dtype=[(col, values.dtype) for col, values in cols.items()])
+        for col, values in cols.items():
+            data[col] = values
+        np.save(os.path.join(dirname, name + ".npy"), data)
+
+
+def load_logs(dirname: str = ".") -> Dict[str, Dict[str, np.ndarray]]:
+    return {name: load_log(dirname, name) for name in LOG_COLUMNS}
+
+
+def has_rows(log) -> bool:
+    return log is not None and len(log["time"]) > 0
+
+
+def mid_price_series(logs) -> (np.ndarray, np.ndarray):
+    """
+    Time and mid price, taken from the orderbook log if present and the
+    state log otherwise. Returns None, None if neither has any rows.
+    """
+    orderbook = logs.get("orderbook")
+    if has_rows(orderbook):
+        return orderbook["time"], (orderbook["best_bid"] + orderbook["best_ask"]) / 2
+    state = logs.get("state")
+    if has_rows(state):
+        return state["time"], state["mid_price"]
+    return None, None
+
+
+def mid_at(times: np.ndarray, mid_time: np.ndarray, mid: np.ndarray) -> np.ndarray:
+    # Last known mid at or before each time, nan before the first quote
+    idx = np.searchsorted(mid_time, times, side="right") - 1
+    out = mid[np.clip(idx, 0, len(mid) - 1)].astype(float)
+    out[idx < 0] = np.nan
+    return out
+
+
+def get_fills(orders) -> Dict[str, np.ndarray]:
+    is_fill = orders["action"] == "FILL"
+    side = np.where(orders["side"][is_fill] == "BUY", 1, -1)
+    return {
+        "time": orders["time"][is_fill],
+        "price": orders["limit"][is_fill],
+        "quantity": orders["quantity"][is_fill],
+        "side": side,
+    }
+
+
+def pnl(fills, mark: float, comission: float = 0.1 / 100) -> Dict[str, float]:
+    """
+    Split PnL into realized and unrealized using a running average cost
+    over the fills in time order. Fills that reduce the position realize
+    against the average entry price, the rest of the position is marked
+    against it. Fees are taken out of realized PnL.
+
+    The entry price after a partial close depends on every earlier fill,
+    so this walks the fills in a loop rather than vectorizing. Fills are
+    few compared with the other logs, so it stays fast.
+    """
+    order = np.argsort(fills["time"], kind="stable")
+    position, entry, realized = 0.0, 0.0, 0.0
+    for side, qty, price in zip(fills["side"][order], fills["quantity"][order], fills["price"][order]):
+        if abs(position) < 1e-12 or np.sign(position) == side:
+            entry = (entry * abs(position) + price * qty) / (abs(position) + qty)
+            position += side * qty
+            continue
+
+        closed = min(qty, abs(position))
+        realized += closed * (price - entry) * np.sign(position)
+        position += side * qty
+        if abs(position) < 1e-12:
+            position, entry = 0.0, 0.0
+        elif qty > closed:
+            # Position reversed, the remainder was opened at this price
+            entry = price
+
+    fees = (fills["quantity"] * fills["price"]).sum() * comission
+    realized -= fees
+    unrealized = position * (mark - entry) if position else 0.0
+
+    return {
+        "realized": realized,
+        "unrealized": unrealized,
+        "total": realized + unrealized,
+        "fees": fees,
+    }
+
+
+def spread_capture(fills, mid_time, mid) -> np.ndarray:
+    # Distance from mid earned by each fill, positive when filled on the good side
+    return fills["side"] * (mid_at(fills["time"], mid_time, mid) - fills["price"])
+
+
+def adverse_selection(fills, mid_time, mid, horizons: Sequence[float]) -> np.ndarray:
+    """
+    Markout of each fill against the mid price at each horizon (seconds),
+    shape (len(horizons), n_fills). Negative means the mid moved against us.
+    """
+    horizons = np.asarray(horizons, dtype=float)
+    mid_now = mid_at(fills["time"], mid_time, mid)
+    later = fills["time"][None, :] + horizons[:, None]
+    mid_later = mid_at(later.ravel(), mid_time, mid).reshape(later.shape)
+    # Horizons beyond the end of the log are unknown
+    mid_later[later > mid_time[-1]] = np.nan
+    return fills["side"][None, :] * (mid_later - mid_now[None, :])
+
+
+def holding_times(state) -> np.ndarray:
+    """
+    Durations of each stretch of non-zero inventory, split on sign changes.
+    """
+    # Treat float residue from fractional lots as flat
+    inventory = state["inventory"]
+    t, q = state["time"], np.where(np.abs(inventory) < 1e-9, 0, np.sign(inventory))
+    if len(q) == 0:
+        return np.array([])
+    change = np.flatnonzero(np.diff(q) != 0) + 1
+    starts = np.concatenate([[0], change])
+    ends = np.concatenate([change, [len(q)]])
+    held = q[starts] != 0
+    end_times = t[np.minimum(ends, len(t) - 1)]
+    return (end_times - t[starts])[held]
+
+
+def fill_ratios(orders) -> Dict[str, float]:
+    ratios = {}
+    for side in ("BUY", "SELL"):
+        is_side = orders["side"] == side
+        submitted = np.count_nonzero(is_side & (orders["action"] == "SUBMIT"))
+        filled = np.count_nonzero(is_side & (orders["action"] == "FILL"))
+        ratios[side] = filled / submitted if submitted else np.nan
+    return ratios
+
+
+def sharpe(time: np.ndarray, equity: np.ndarray) -> float:
+    """
+    Annualised Sharpe of per-sample equity changes, using the median
+    sample interval. Equity is in quote currency, so this is on PnL
+    rather than returns.
+    """
+    if len(equity) < 3:
+        return np.nan
+    changes = np.diff(equity)
+    std = changes.std()
+    if std == 0:
+        return np.nan
+    dt = np.median(np.diff(time))
+    if dt <= 0:
+        return np.nan
+    return changes.mean() / std * np.sqrt(SECONDS_PER_YEAR / dt)
+
+
+def max_drawdown(equity: np.ndarray) -> float:
+    if len(equity) == 0:
+        return np.nan
+    return (np.maximum.accumulate(equity) - equity).max()
+
+
+def analyse(dirname: str = ".", horizons: Sequence[float] = (1, 5, 30, 60), comission: float = 0.1 / 100) -> dict:
+    """
+    Report on whatever logs are in dirname. Fill metrics need the orders
+    log and a mid price, equity metrics need the state log.
+    """
+    logs = load_logs(dirname)
+    state, orders, market = logs["state"], logs["orders"], logs["market"]
+    if state is None and orders is None:
+        raise FileNotFoundError(f"No state.csv or orders.csv in {dirname}, nothing to report on")
+
+    mid_time, mid = mid_price_series(logs)
+    report = {}
+
+    with np.errstate(invalid="ignore"):
+        if has_rows(state):
+            held = holding_times(state)
+            report.update({
+                "duration": state["time"][-1] - state["time"][0],
+                "equity": state["equity"][-1],
+                "holding_time": held.mean() if len(held) else np.nan,
+                "max_holding_time": held.max() if len(held) else np.nan,
+                "sharpe": sharpe(state["time"], state["equity"]),
+                "max_drawdown": max_drawdown(state["equity"]),
+            })
+
+        if orders is not None:
+            fills = get_fills(orders)
+            report["n_fills"] = len(fills["time"])
+            report["fill_ratio"] = fill_ratios(orders)
+
+            if has_rows(market):
+                market_qty = market["quantity"].sum()
+                report["volume_share"] = fills["quantity"].sum() / market_qty if market_qty else np.nan
+
+            if mid is not None:
+                capture = spread_capture(fills, mid_time, mid)
+                markouts = adverse_selection(fills, mid_time, mid, horizons)
+                report["pnl"] = pnl(fills, mid[-1], comission)
+                report["spread_capture"] = np.nanmean(capture) if len(capture) else np.nan
+                report["adverse_selection"] = {
+                    h: np.nanmean(m) if len(m) else np.nan for h, m in zip(horizons, markouts)
+                }
+
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = []
+    if "duration" in report:
+        lines.append(f"duration          {report['duration']:.1f}s")
+    if "n_fills" in report:
+        lines.append(f"fills             {report['n_fills']}")
+    if "pnl" in report:
+        pnl = report["pnl"]
+        lines.append(f"pnl               {pnl['total']:.4f} (realized {pnl['realized']:.4f}, unrealized {pnl['unrealized']:.4f}, fees {pnl['fees']:.4f})")
+    if "equity" in report:
+        lines.append(f"equity            {report['equity']:.4f}")
+    if "spread_capture" in report:
+        lines.append(f"spread capture    {report['spread_capture']:.6f} per fill")
+        lines.append("adverse selection " + ", ".join(f"{h}s {v:.6f}" for h, v in report["adverse_selection"].items()))
+    if "holding_time" in report:
+        lines.append(f"holding time      {report['holding_time']:.1f}s mean, {report['max_holding_time']:.1f}s max")
+    if "fill_ratio" in report:
+        lines.append("fill ratio        " + ", ".join(f"{side} {v:.3f}" for side, v in report["fill_ratio"].items()))
+    if "volume_share" in report:
+        lines.append(f"volume share      {report['volume_share']:.4%}")
+    if "sharpe" in report:
+        lines.append(f"sharpe            {report['sharpe']:.2f}")
+        lines.append(f"max drawdown      {report['max_drawdown']:.4f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    dirname = sys.argv[1] if len(sys.argv) > 1 else "."
+    try:
+        print(format_report(analyse(dirname)))
+    except FileNotFoundError as e:
+        sys.exit(str(e))
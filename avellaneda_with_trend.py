@@ -1,5 +1,4 @@
 from typing import Tuple
-import matplotlib
 import numpy as np
 
 class CircularBuffer:
@@ -90,7 +89,31 @@ class AvellanedaWithTrend:
         # print(self.s_buffer.data)
         return self.s - delta_bid * self.bid_ask_spread / 2 * self.ticksize, self.s + delta_ask * self.bid_ask_spread / 2 * self.ticksize
 
+    def get_ladder(self, q: float, levels: int, spacing: float = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bid and ask prices for a ladder of levels per side, starting at the
+        optimal bid/ask and stepping away from the mid by spacing ticks.
+        Bids are rounded down and asks up, so no level is more aggressive
+        than the model price.
+        """
+        bid, ask = self.get_bid_ask(q)
+        # A flat book has zero variance, which makes the model price nan
+        if bid is None or not np.isfinite(bid) or not np.isfinite(ask):
+            return None, None
+        steps = np.arange(levels) * spacing * self.ticksize
+        # The epsilon stops float error pushing exact ticks to the next one
+        bids = np.floor((bid - steps) / self.ticksize + 1e-9) * self.ticksize
+        asks = np.ceil((ask + steps) / self.ticksize - 1e-9) * self.ticksize
+        return bids, asks
+
     def is_ready(self) -> bool:
         return self.s_buffer.is_ready()
 
 
+class BidAskGenerator(AvellanedaWithTrend):
+
+    def get_A(self):
+        return 0.9 
+
+    def get_k(self):
+        return 2 / self.bid_ask_spread
@@ -1,7 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from avellaneda_with_trend import AvellanedaWithTrend
-from market_maker import BidAskGenerator
+from avellaneda_with_trend import BidAskGenerator
 
 
 def main():
@@ -0,0 +1,92 @@
+"""
+Headless entry point for the trading processes.
+
+    python cli.py run SRMBUSD --interval 0 --lookback 20
+    python cli.py run SRMBUSD --levels 5 --size-curve geometric --size-decay 0.7
+    python cli.py record SOLBUSD 100
+    python cli.py backtest SOLBUSD100-09122021182710
+    python cli.py report .
+
+Each command imports only what it needs, so run and record never load
+matplotlib or pandas.
+"""
+import argparse
+import sys
+
+
+def run(args):
+    from market_maker import run
+    run(
+        args.ticker, args.interval, args.lookback,
+        levels=args.levels,
+        level_spacing=args.level_spacing,
+        size_curve=args.size_curve,
+        size_step=args.size_step,
+        size_decay=args.size_decay,
+        inventory_skew=args.inventory_skew,
+        lot_size=args.lot_size,
+    )
+
+
+def record(args):
+    from record_data import record
+    record(args.ticker, args.interval)
+
+
+def backtest(args):
+    from backtest import MockOrderBook
+    MockOrderBook(args.dirname).loop()
+
+
+def report(args):
+    from analytics import analyse, format_report
+    try:
+        print(format_report(analyse(args.dirname)))
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+
+
+def plot(args):
+    from test import main
+    main(run_live=False)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Market making")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="quote a ticker live")
+    run_parser.add_argument("ticker")
+    run_parser.add_argument("--interval", type=int, default=0)
+    run_parser.add_argument("--lookback", type=int, default=20)
+    run_parser.add_argument("--levels", type=int, default=None, help="quote a ladder of this many levels per side")
+    run_parser.add_argument("--level-spacing", type=float, default=1, help="ticks between ladder levels")
+    run_parser.add_argument("--size-curve", choices=("linear", "geometric", "skewed"), default="linear")
+    run_parser.add_argument("--size-step", type=float, default=0.5, help="linear curve: size growth per level, as a fraction of quantity")
+    run_parser.add_argument("--size-decay", type=float, default=0.5, help="geometric curve: size ratio between levels")
+    run_parser.add_argument("--inventory-skew", type=float, default=0.1, help="skewed curve: exp(-skew * inventory) bid size scale")
+    run_parser.add_argument("--lot-size", type=float, default=0.01)
+    run_parser.set_defaults(func=run)
+
+    record_parser = subparsers.add_parser("record", help="record orderbook and trades to a new directory")
+    record_parser.add_argument("ticker")
+    record_parser.add_argument("interval", type=int)
+    record_parser.set_defaults(func=record)
+
+    backtest_parser = subparsers.add_parser("backtest", help="replay a recorded directory")
+    backtest_parser.add_argument("dirname")
+    backtest_parser.set_defaults(func=backtest)
+
+    report_parser = subparsers.add_parser("report", help="print performance analytics for a log directory")
+    report_parser.add_argument("dirname", nargs="?", default=".")
+    report_parser.set_defaults(func=report)
+
+    plot_parser = subparsers.add_parser("plot", help="live plot the logs in the current directory")
+    plot_parser.set_defaults(func=plot)
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = get_parser().parse_args()
+    args.func(args)
@@ -1,13 +1,10 @@
 from enum import Enum
 import time
-from datetime import datetime
 import asyncio
 import numpy as np
 
-from binance import Client
-
 from order_book import OrderBook
-from avellaneda_with_trend import AvellanedaWithTrend
+from avellaneda_with_trend import BidAskGenerator
 
 
 class Side(Enum):
@@ -15,15 +12,6 @@ class Side(Enum):
     SELL = -1
     BOTH = 0
 
-class BidAskGenerator(AvellanedaWithTrend):
-
-    def get_A(self):
-        return 0.9 
-
-    def get_k(self):
-        return 2 / self.bid_ask_spread
-
-
 class OrderState(Enum):
     PENDING = 0
     SUBMITTED = 1
@@ -31,7 +19,7 @@ class OrderState(Enum):
     CANCELED = -1
 
 class Order:
-    def __init__(self, id: int, ticker: str, quantity: float, limit: float, side: Side, expiry: float):
+    def __init__(self, id: int, ticker: str, quantity: float, limit: float, side: Side, expiry: float, order_fname: str = "orders.csv"):
         self.ticker = ticker
         self.quantity = quantity
         self.limit = limit
@@ -39,13 +27,8 @@ class Order:
         self.state = OrderState.PENDING       
         self.expiry_time = time.time() + expiry
         self.id = id
-        self.order_fname = "orders.csv"
-        with open(self.order_fname, "w") as f:
-            f.write(",".join([
-                "time", "id", "action", "limit", "quantity", "side"
-            ]))
-            f.write("\n")
-  
+        self.order_fname = order_fname
+
         self.submit()        
 
 
@@ -78,11 +61,22 @@ class Order:
             f.write("\n")
 
 
+SIZE_CURVES = ("linear", "geometric", "skewed")
+
+
 class MarketMaker:
-    def __init__(self, ticker: str, interval: int, lookback: int = 20):
-        self.client = Client()
+    def __init__(self, ticker: str, interval: int, lookback: int = 20, levels: int = None,
+                 level_spacing: float = 1, size_curve: str = "linear", size_step: float = 0.5,
+                 size_decay: float = 0.5, inventory_skew: float = 0.1, lot_size: float = 0.01):
+        if levels is not None and levels < 1:
+            raise ValueError(f"levels must be at least 1, got {levels}")
+        if level_spacing < 1:
+            raise ValueError(f"level_spacing must be at least 1 tick, got {level_spacing}")
+        if size_curve not in SIZE_CURVES:
+            raise ValueError(f"Unknown size curve {size_curve}, expected one of {', '.join(SIZE_CURVES)}")
+
         self.ticker = ticker
-        ticksize = 0.01
+        ticksize = self.ticksize = 0.01
         self.orderbook = OrderBook(ticker, interval)
         self.bid_ask_generator = BidAskGenerator(1, ticksize, lookback, 1 if not interval else 0.01)
         
@@ -94,6 +88,30 @@ class MarketMaker:
             Side.SELL: None
         }
 
+        # Ladder mode quotes levels orders per side instead of one,
+        # keyed by price in ticks so unchanged levels can be left alone
+        self.levels = levels
+        self.ladder = {
+            Side.BUY: {},
+            Side.SELL: {}
+        }
+        # Ticks filled at since the desired ladder last moved, not re-placed until it does
+        self.ladder_fills = {
+            Side.BUY: set(),
+            Side.SELL: set()
+        }
+        # Tick -> size of the last desired ladder on each side
+        self.desired_ladder = {
+            Side.BUY: {},
+            Side.SELL: {}
+        }
+        self.level_spacing = level_spacing
+        self.size_curve = size_curve
+        self.size_step = size_step
+        self.size_decay = size_decay
+        self.inventory_skew = inventory_skew
+        self.lot_size = lot_size
+
         self.order_id = 0
 
         self.expiry = 1
@@ -113,15 +131,29 @@ class MarketMaker:
             ]))
             f.write("\n")
 
+        self.order_fname = "orders.csv"
+        with open(self.order_fname, "w") as f:
+            f.write(",".join([
+                "time", "id", "action", "limit", "quantity", "side"
+            ]))
+            f.write("\n")
 
-
-
+    @property
+    def client(self):
+        return self.orderbook.client
 
     def get_equity(self) -> float:
         return self.inventory * (self.bid_ask_generator.s or 0) + self.cash
 
     async def check_expiry(self):
         now = time.time()
+        if self.levels:
+            for orders in self.ladder.values():
+                for order in orders.values():
+                    if order.expiry_time < now:
+                        await order.cancel()
+            return
+
         buy_order: Order = self.orders[Side.BUY]
         sell_order: Order = self.orders[Side.SELL]
         if not buy_order or not sell_order:
@@ -136,6 +168,11 @@ class MarketMaker:
     async def on_orderbook_update(self):
         # print("Equity:", self.get_equity(), "Inventory:", self.inventory)
         self.bid_ask_generator.update_order_book(self.orderbook.get_best_bid(), self.orderbook.get_best_ask())
+
+        if self.levels:
+            await self.on_orderbook_update_ladder()
+            return
+
         await self.check_expiry()
 
         buy_order: Order = self.orders[Side.BUY]
@@ -162,7 +199,7 @@ class MarketMaker:
             if not buy_order or bid != buy_order.limit:
                 if buy_order:
                     await buy_order.cancel()
-                order =self.orders[Side.BUY] = Order(self.order_id, self.ticker, self.quantity, bid, Side.BUY, self.expiry) 
+                order =self.orders[Side.BUY] = Order(self.order_id, self.ticker, self.quantity, bid, Side.BUY, self.expiry, self.order_fname)
                 self.order_id += 1
                 if order.limit >= self.bid_ask_generator.best_bid:
                     await self.fill(order)
@@ -172,13 +209,98 @@ class MarketMaker:
             if not sell_order or ask != sell_order.limit:
                 if sell_order:
                     await sell_order.cancel()
-                order = self.orders[Side.SELL] = Order(self.order_id, self.ticker, self.quantity, ask, Side.SELL, self.expiry)
+                order = self.orders[Side.SELL] = Order(self.order_id, self.ticker, self.quantity, ask, Side.SELL, self.expiry, self.order_fname)
                 self.order_id += 1
                 if order.limit <= self.bid_ask_generator.best_ask:
                     await self.fill(order)
 
 
 
+    async def on_orderbook_update_ladder(self):
+        if self.bid_ask_generator.is_ready():
+            await asyncio.create_task(self.write_state())
+            await self.requote_ladder()
+
+        # Levels that are still wanted had their expiry refreshed by requote_ladder
+        await self.check_expiry()
+
+    def get_ladder_sizes(self):
+        """
+        Order sizes for each level of the bid and ask ladders.
+        linear: quantity * (1 + size_step * level)
+        geometric: quantity * size_decay ** level
+        skewed: quantity, shrinking the side that would add to inventory
+        """
+        level = np.arange(self.levels)
+        if self.size_curve == "linear":
+            sizes = self.quantity * (1 + self.size_step * level)
+            bid_sizes, ask_sizes = sizes, sizes
+        elif self.size_curve == "geometric":
+            sizes = self.quantity * self.size_decay ** level
+            bid_sizes, ask_sizes = sizes, sizes
+        else:
+            sizes = np.full(self.levels, self.quantity, dtype=float)
+            bid_sizes = sizes * np.exp(-self.inventory_skew * self.inventory)
+            ask_sizes = sizes * np.exp(self.inventory_skew * self.inventory)
+
+        bid_sizes = np.round(bid_sizes / self.lot_size) * self.lot_size
+        ask_sizes = np.round(ask_sizes / self.lot_size) * self.lot_size
+        return bid_sizes, ask_sizes
+
+    async def requote_ladder(self):
+        bids, asks = self.bid_ask_generator.get_ladder(self.inventory, self.levels, self.level_spacing)
+        if bids is None:
+            return
+        bid_sizes, ask_sizes = self.get_ladder_sizes()
+        await self.update_ladder(Side.BUY, bids, bid_sizes)
+        await self.update_ladder(Side.SELL, asks, ask_sizes)
+
+    async def update_ladder(self, side: Side, prices: np.ndarray, sizes: np.ndarray):
+        """
+        Diff the desired levels against the live orders on one side, only
+        cancelling and placing the levels that changed. Live orders that are
+        still wanted get their expiry refreshed, and a level that filled is
+        only placed again once the desired ladder moves.
+        """
+        valid = np.isfinite(prices) & (sizes > 0)
+        prices, sizes = prices[valid], sizes[valid]
+        ticks = np.round(prices / self.ticksize).astype(int)
+        desired = dict(zip(ticks.tolist(), zip(prices.tolist(), sizes.tolist())))
+
+        # Record fills before comparing, so a fill that moves the ladder
+        # is forgotten along with the ladder it belonged to
+        for tick, order in self.ladder[side].items():
+            if order.state == OrderState.FILLED:
+                self.ladder_fills[side].add(tick)
+
+        levels = {tick: size for tick, (_, size) in desired.items()}
+        if levels != self.desired_ladder[side]:
+            self.desired_ladder[side] = levels
+            self.ladder_fills[side].clear()
+
+        expiry_time = time.time() + self.expiry
+        ladder = {}
+        for tick, order in self.ladder[side].items():
+            if order.state != OrderState.SUBMITTED:
+                continue
+            if tick in desired and order.quantity == desired[tick][1]:
+                order.expiry_time = expiry_time
+                ladder[tick] = order
+            else:
+                await order.cancel()
+
+        for tick, (price, size) in desired.items():
+            if tick in ladder or tick in self.ladder_fills[side]:
+                continue
+            order = ladder[tick] = Order(self.order_id, self.ticker, size, price, side, self.expiry, self.order_fname)
+            self.order_id += 1
+            if side == Side.BUY and order.limit >= self.bid_ask_generator.best_bid:
+                await self.fill(order)
+            if side == Side.SELL and order.limit <= self.bid_ask_generator.best_ask:
+                await self.fill(order)
+
+        self.ladder[side] = ladder
+
     async def write_state(self):
         with open(self.state_fname, "a") as f:
             f.write(",".join(map(str, [
@@ -211,6 +333,15 @@ class MarketMaker:
     async def on_trade_update(self, res):
         price = float(res["p"])
 
+        if self.levels:
+            for order in self.ladder[Side.BUY].values():
+                if price <= order.limit and order.state == OrderState.SUBMITTED:
+                    await self.fill(order)
+            for order in self.ladder[Side.SELL].values():
+                if price >= order.limit and order.state == OrderState.SUBMITTED:
+                    await self.fill(order)
+            return
+
         buy_order: Order = self.orders[Side.BUY]
         sell_order: Order = self.orders[Side.SELL]
 
@@ -223,8 +354,11 @@ class MarketMaker:
     
 
 
-if __name__ == "__main__":
-    
-    mm = MarketMaker("SRMBUSD", 0)
+def run(ticker: str, interval: int, lookback: int = 20, **kwargs):
+    mm = MarketMaker(ticker, interval, lookback, **kwargs)
     loop = mm.orderbook.get_loop()
-    loop.run_forever()
\ No newline at end of file
+    loop.run_forever()
+
+
+if __name__ == "__main__":
+    run("SRMBUSD", 0)
@@ -1,15 +1,13 @@
 import asyncio
 import time
-from binance import AsyncClient, BinanceSocketManager, Client
 from pprint import pprint
 from collections import OrderedDict
-from concurrent.futures import ProcessPoolExecutor
 
 
 class OrderBook:
     def __init__(self, ticker: str, interval: int = 0, orderbook_fname: str = "orderbook.csv", market_fname: str = "market.csv"):
         self.ticker = ticker
-        self.client = Client()
+        self._client = None
         self.orderbook_update_callback = None
         self.trade_update_callback = None
         self.interval = interval
@@ -30,6 +28,14 @@ class OrderBook:
             ]))
             f.write("\n")
 
+    @property
+    def client(self):
+        # The REST client pings the exchange on creation, so only make it when needed
+        if self._client is None:
+            from binance import Client
+            self._client = Client()
+        return self._client
+
     def get_best_bids(self, depth: int):
         return OrderedDict({k: self.bids[k] for k in sorted(self.bids.keys(), reverse=True)[:depth]})
 
@@ -91,6 +97,7 @@ class OrderBook:
         await self.on_receive_trade(res)
 
     async def depth_update_loop(self):
+        from binance import AsyncClient, BinanceSocketManager
         async_client = await AsyncClient.create()
         bm = BinanceSocketManager(async_client)
 
@@ -103,6 +110,7 @@ class OrderBook:
         await async_client.close_connection()
 
     async def trade_update_loop(self):
+        from binance import AsyncClient, BinanceSocketManager
         async_client = await AsyncClient.create()
         bm = BinanceSocketManager(async_client)
 
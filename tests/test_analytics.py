@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+
+from analytics import adverse_selection, fill_ratios, holding_times, load_log, pnl, sharpe, to_binary
+
+
+def make_fills(sides, quantities, prices):
+    return {
+        "time": np.arange(len(sides), dtype=float),
+        "side": np.array(sides),
+        "quantity": np.array(quantities, dtype=float),
+        "price": np.array(prices, dtype=float),
+    }
+
+
+def test_pnl_round_trip_then_reopen():
+    fills = make_fills([1, -1, 1], [1, 1, 1], [100, 110, 50])
+    result = pnl(fills, 50, comission=0)
+    assert np.isclose(result["realized"], 10)
+    assert np.isclose(result["unrealized"], 0)
+
+
+def test_pnl_reversal():
+    # Long 2 @ 11, sell 3 @ 13 realizes 4 and leaves short 1 @ 13,
+    # selling 1 @ 9 makes it short 2 @ 11, marked at 8
+    fills = make_fills([1, 1, -1, -1], [1, 1, 3, 1], [10, 12, 13, 9])
+    result = pnl(fills, 8, comission=0)
+    assert np.isclose(result["realized"], 4)
+    assert np.isclose(result["unrealized"], 6)
+    assert np.isclose(result["total"], 10)
+
+
+def test_pnl_fees_come_out_of_realized():
+    fills = make_fills([1, -1], [1, 1], [100, 110])
+    result = pnl(fills, 110, comission=0.01)
+    assert np.isclose(result["fees"], 2.1)
+    assert np.isclose(result["realized"], 10 - 2.1)
+
+
+def test_adverse_selection():
+    mid_time = np.array([0., 1, 2, 3])
+    mid = np.array([10., 10, 11, 9])
+    fills = {"time": np.array([1., 2]), "side": np.array([1, -1]), "price": np.array([10., 11])}
+    markouts = adverse_selection(fills, mid_time, mid, (1, 2))
+    assert np.allclose(markouts[0], [1, 2])
+    # Two seconds after the sell fill is past the end of the log
+    assert np.isclose(markouts[1, 0], -1)
+    assert np.isnan(markouts[1, 1])
+
+
+def test_holding_times():
+    state = {
+        "time": np.array([0., 1, 2, 3, 4, 5]),
+        "inventory": np.array([0, 1, 1, -1, 1e-17, 0]),
+    }
+    assert np.allclose(holding_times(state), [2, 1])
+
+
+def test_fill_ratios():
+    orders = {
+        "action": np.array(["SUBMIT", "FILL", "SUBMIT", "CANCEL", "SUBMIT"]),
+        "side": np.array(["BUY", "BUY", "BUY", "BUY", "SELL"]),
+    }
+    assert fill_ratios(orders) == {"BUY": 0.5, "SELL": 0}
+
+
+def test_sharpe_zero_interval():
+    assert np.isnan(sharpe(np.zeros(4), np.array([0., 1, 0, 2])))
+
+
+def test_load_log_prefers_newer_csv(tmp_path):
+    csv_fname = tmp_path / "market.csv"
+    csv_fname.write_text("time,price,quantity\n1,10,1\n")
+    to_binary(str(tmp_path), ["market"])
+    assert np.allclose(load_log(str(tmp_path), "market")["price"], [10])
+
+    csv_fname.write_text("time,price,quantity\n2,20,1\n")
+    npy_mtime = os.path.getmtime(tmp_path / "market.npy")
+    os.utime(csv_fname, (npy_mtime + 1, npy_mtime + 1))
+    assert np.allclose(load_log(str(tmp_path), "market")["price"], [20])
@@ -0,0 +1,122 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import market_maker
+from avellaneda_with_trend import BidAskGenerator
+from market_maker import MarketMaker, OrderState, Side
+
+
+class StubOrderBook:
+    def __init__(self, ticker, interval):
+        self.orderbook_update_callback = None
+        self.trade_update_callback = None
+
+
+@pytest.fixture
+def mm(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(market_maker, "OrderBook", StubOrderBook)
+    mm = MarketMaker("SRMBUSD", 0, levels=3)
+    mm.bid_ask_generator.best_bid = 10.01
+    mm.bid_ask_generator.best_ask = 10.03
+    return mm
+
+
+def set_ladder(mm, bids, asks):
+    mm.bid_ask_generator.get_ladder = lambda q, levels, spacing: (np.array(bids), np.array(asks))
+
+
+def live(mm, side):
+    return {tick: order for tick, order in mm.ladder[side].items() if order.state == OrderState.SUBMITTED}
+
+
+def test_get_ladder_rounds_away_from_touch():
+    generator = BidAskGenerator(1, 0.01)
+    generator.get_bid_ask = lambda q: (10.0078, 10.0322)
+    bids, asks = generator.get_ladder(0, 2, 1)
+    assert np.allclose(bids, [10.00, 9.99])
+    assert np.allclose(asks, [10.04, 10.05])
+
+
+def test_get_ladder_flat_book():
+    generator = BidAskGenerator(1, 0.01)
+    generator.get_bid_ask = lambda q: (np.nan, np.nan)
+    assert generator.get_ladder(0, 2, 1) == (None, None)
+
+
+def test_ladder_sizes(mm):
+    bid_sizes, ask_sizes = mm.get_ladder_sizes()
+    assert np.allclose(bid_sizes, [1, 1.5, 2])
+    assert np.allclose(ask_sizes, [1, 1.5, 2])
+
+    mm.size_curve = "geometric"
+    bid_sizes, _ = mm.get_ladder_sizes()
+    assert np.allclose(bid_sizes, [1, 0.5, 0.25])
+
+    mm.size_curve = "skewed"
+    mm.inventory = 2
+    bid_sizes, ask_sizes = mm.get_ladder_sizes()
+    assert np.allclose(bid_sizes, np.round(np.exp(-0.2), 2))
+    assert np.allclose(ask_sizes, np.round(np.exp(0.2), 2))
+
+
+def test_unchanged_ladder_places_nothing(mm):
+    set_ladder(mm, [10.00, 9.99, 9.98], [10.04, 10.05, 10.06])
+    asyncio.run(mm.requote_ladder())
+    assert mm.order_id == 6
+
+    asyncio.run(mm.requote_ladder())
+    assert mm.order_id == 6
+    assert sorted(live(mm, Side.BUY)) == [998, 999, 1000]
+    assert sorted(live(mm, Side.SELL)) == [1004, 1005, 1006]
+
+
+def test_changed_level_replaces_only_that_level(mm):
+    set_ladder(mm, [10.00, 9.99, 9.98], [10.04, 10.05, 10.06])
+    asyncio.run(mm.requote_ladder())
+    before = dict(mm.ladder[Side.BUY])
+
+    set_ladder(mm, [10.00, 9.99, 9.97], [10.04, 10.05, 10.06])
+    asyncio.run(mm.requote_ladder())
+    assert mm.order_id == 7
+    assert before[998].state == OrderState.CANCELED
+    assert live(mm, Side.BUY)[1000] is before[1000]
+    assert live(mm, Side.BUY)[999] is before[999]
+    assert 997 in live(mm, Side.BUY)
+
+
+def test_filled_level_replaced_only_after_ladder_moves(mm):
+    set_ladder(mm, [10.00, 9.99, 9.98], [10.04, 10.05, 10.06])
+    asyncio.run(mm.requote_ladder())
+    asyncio.run(mm.fill(mm.ladder[Side.BUY][1000]))
+
+    asyncio.run(mm.requote_ladder())
+    asyncio.run(mm.requote_ladder())
+    assert mm.order_id == 6
+    assert 1000 not in live(mm, Side.BUY)
+
+    set_ladder(mm, [10.00, 9.99, 9.97], [10.04, 10.05, 10.06])
+    asyncio.run(mm.requote_ladder())
+    assert 1000 in live(mm, Side.BUY)
+
+
+def test_wanted_levels_do_not_expire(mm):
+    set_ladder(mm, [10.00, 9.99, 9.98], [10.04, 10.05, 10.06])
+    asyncio.run(mm.requote_ladder())
+    for order in mm.ladder[Side.BUY].values():
+        order.expiry_time = 0
+
+    asyncio.run(mm.requote_ladder())
+    asyncio.run(mm.check_expiry())
+    assert mm.order_id == 6
+    assert len(live(mm, Side.BUY)) == 3
+
+
+@pytest.mark.parametrize("kwargs", [{"levels": 0}, {"levels": -1}, {"levels": 3, "level_spacing": 0.5}, {"size_curve": "bogus"}])
+def test_invalid_ladder_settings(tmp_path, monkeypatch, kwargs):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(market_maker, "OrderBook", StubOrderBook)
+    with pytest.raises(ValueError):
+        MarketMaker("SRMBUSD", 0, **kwargs)